@@ -8,6 +8,24 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 async def async_session_factory(
     bind: AsyncEngine,
 ) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open an AsyncSession on the given engine and run it in a single transaction.
+
+    The transaction is committed on exit and rolled back if an exception is raised.
+    The engine should pool connections with `AsyncAdaptedQueuePool` (the default
+    for `create_async_engine` with most drivers) or `NullPool`; asyncio engines
+    reject the thread-based `QueuePool`.
+    Statements built by the CRUD classes have stable cache keys, so their compiled
+    form is reused from the engine's compiled cache; size it with
+    `create_async_engine(query_cache_size=...)` when an application issues many
+    distinct queries.
+
+    Args:
+        bind (AsyncEngine): The engine to bind the session to.
+
+    Yields:
+        AsyncSession: The session to run CRUD operations with.
+    """
     async with AsyncSession(bind=bind, expire_on_commit=False) as session:
         try:
             await session.begin()
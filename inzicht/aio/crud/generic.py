@@ -1,56 +1,107 @@
 import logging
-from asyncio import Lock
-from collections.abc import Generator, Sequence
-from typing import Any, TypeVar, get_args
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, ClassVar, TypeVar, cast, get_args, get_origin
 
 import sqlalchemy.exc
-from sqlalchemy import func, select
+from sqlalchemy import CursorResult, case, func, insert, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
 from inzicht.aio.crud.interfaces import AioCRUDInterface
-from inzicht.crud.errors import DoesNotExistError, IntegrityError, UnknowError
+from inzicht.crud.errors import (
+    DoesNotExistError,
+    IntegrityError,
+    MultipleResultsError,
+    UnknowError,
+)
+from inzicht.crud.generic import parametrize
+from inzicht.crud.statements import (
+    count_query,
+    delete_query,
+    delete_returning_query,
+    exists_query,
+    many_to_many_queries,
+    primary_key_column,
+)
 from inzicht.declarative import DeclarativeBase
 
 T = TypeVar("T", bound=DeclarativeBase)
 
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-
-handler = logging.StreamHandler()
-handler.setLevel(logging.INFO)
-handler.setFormatter(formatter)
-
 logger = logging.getLogger("aio.crud.generic")
-logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+if not logger.handlers:
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    handler = logging.StreamHandler()
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
 
 
 class AioGenericCRUD(AioCRUDInterface[T]):
+    """
+    Generic asynchronous CRUD operations bound to a single AsyncSession.
+
+    An AsyncSession is not safe for concurrent use, so the same instance must not
+    be shared across tasks. Tasks that need to write concurrently should each open
+    their own session via `async_session_factory` and create their own CRUD instance.
+    To insert many records, prefer `bulk_create` over gathering `create` calls: it
+    sends a single statement instead of one round trip per record.
+    """
+
+    _model: type[T] | None = None
+    default_options: ClassVar[Sequence[ORMOption]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for base in cls.__dict__.get("__orig_bases__", ()):
+            origin = get_origin(base)
+            if isinstance(origin, type) and issubclass(origin, AioGenericCRUD):
+                (model,) = get_args(base)
+                if not isinstance(model, TypeVar):
+                    cls._model = model
+
+    def __class_getitem__(cls, item: Any) -> Any:
+        alias = super().__class_getitem__(item)  # type: ignore[misc]
+        if isinstance(item, TypeVar):
+            return alias
+        return parametrize(alias)
+
     def __init__(self, async_session: AsyncSession) -> None:
         self.async_session = async_session
-        self.lock = Lock()
 
     def get_model(self) -> type[T]:
-        if hasattr(self, "__orig_class__"):
-            (model,) = get_args(self.__orig_class__)
-        elif hasattr(self, "__orig_bases__"):
-            (base,) = self.__orig_bases__
-            (model,) = get_args(base)
-        else:
+        if self._model is None:
             raise TypeError(
                 f"Can't define type parameter of generic class {self.__class__}"
             )
-        return model
+        return self._model
 
     async def count(self, where: Any | None = None) -> int:
         model = self.get_model()
-        query = select(func.count()).select_from(model)
+        query = lambda_stmt(lambda: count_query(model))
         if where is not None:
-            query = query.filter(where)
-        result = await self.async_session.execute(query)
-        count = result.scalar() or 0
+            query += lambda q: q.filter(where)
+        count = await self.async_session.scalar(query) or 0
         return count
 
+    async def count_many(self, conditions: Mapping[str, Any | None]) -> dict[str, int]:
+        model = self.get_model()
+        if not conditions:
+            return {}
+        columns = [
+            (
+                func.count() if condition is None else func.count(case((condition, 1)))
+            ).label(name)
+            for name, condition in conditions.items()
+        ]
+        result = await self.async_session.execute(select(*columns).select_from(model))
+        row = result.one()
+        counts = dict(row._mapping)
+        return counts
+
     async def create(self, instance: T | None = None, /, **kwargs: Any) -> T:
         model = self.get_model()
         if instance and kwargs:
@@ -58,50 +109,111 @@ class AioGenericCRUD(AioCRUDInterface[T]):
                 "Cannot provide both 'instance' and keyword arguments for creation"
             )
         instance = instance or model.new(**kwargs)
-        header = f"DB operation [CREATE] on instance '{instance}' of model '{model}'"
         try:
-            async with self.lock:
-                self.async_session.add(instance)
-                await self.async_session.flush()
-        except sqlalchemy.exc.IntegrityError as error:
-            error_message = f"{header} failed because of integrity constraints"
-            logger.error(error_message)
-            raise IntegrityError(error_message, **kwargs) from error
+            self.async_session.add(instance)
+            await self.async_session.flush()
         except Exception as error:
+            header = (
+                f"DB operation [CREATE] on instance '{instance}' of model '{model}'"
+            )
+            if isinstance(error, sqlalchemy.exc.IntegrityError):
+                error_message = f"{header} failed because of integrity constraints"
+                logger.error(error_message)
+                raise IntegrityError(error_message, **kwargs) from error
             error_message = f"{header} failed because of unknown error"
             logger.error(error_message)
             raise UnknowError(error_message, **kwargs) from error
-        logger.info(f"{header} succeeded")
+        logger.info(
+            "DB operation [CREATE] on instance '%s' of model '%s' succeeded",
+            instance,
+            model,
+        )
         return instance
 
-    async def bulk_create(self, instances: Sequence[T]) -> Sequence[T]:
+    async def bulk_create(
+        self, instances: Sequence[T] | Sequence[Mapping[str, Any]]
+    ) -> Sequence[T]:
         model = self.get_model()
-        header = f"DB operation [BULK_CREATE] on {len(instances)} instances '[{instances[0]},...]' of model '{model}'"
+        if not instances:
+            return []
         try:
-            self.async_session.add_all(instances)
-            await self.async_session.flush()
-        except sqlalchemy.exc.IntegrityError as error:
-            error_message = f"{header} failed because of integrity constraints"
-            logger.error(error_message)
-            raise IntegrityError(error_message) from error
+            if isinstance(instances[0], Mapping):
+                keys = model._get_safe_column_keys()
+                payloads = [
+                    {k: v for k, v in item.items() if k in keys}
+                    for item in cast(Sequence[Mapping[str, Any]], instances)
+                ]
+                query = insert(model).returning(model, sort_by_parameter_order=True)
+                result = await self.async_session.scalars(query, payloads)
+                created = result.all()
+            else:
+                created = cast(Sequence[T], instances)
+                self.async_session.add_all(created)
+                await self.async_session.flush()
         except Exception as error:
+            header = f"DB operation [BULK_CREATE] on {len(instances)} instances of model '{model}'"
+            if isinstance(error, sqlalchemy.exc.IntegrityError):
+                error_message = f"{header} failed because of integrity constraints"
+                logger.error(error_message)
+                raise IntegrityError(error_message) from error
             error_message = f"{header} failed because of unknow error"
             logger.error(error_message)
             raise UnknowError(error_message) from error
-        logger.info(f"{header} succeeded")
-        return instances
+        logger.info(
+            "DB operation [BULK_CREATE] on %s instances of model '%s' succeeded",
+            len(created),
+            model,
+        )
+        return created
 
-    async def get(self, id: int | str, /) -> T:
+    async def get(
+        self,
+        id: int | str | tuple[Any, ...],
+        /,
+        *,
+        options: Sequence[ORMOption] | None = None,
+    ) -> T:
         model = self.get_model()
-        instance = await self.async_session.get(model, id)
-        header = f"DB operation [GET] on instance of model '{model}' with id '{id}'"
+        if options is None:
+            options = self.default_options
+        instance = await self.async_session.get(model, id, options=options)
         if not instance:
+            header = f"DB operation [GET] on instance of model '{model}' with id '{id}'"
             error_message = f"{header} failed because the instance was not found"
             logger.error(error_message)
             raise DoesNotExistError(error_message, id=id)
-        logger.info(f"{header} succeeded")
+        logger.info(
+            "DB operation [GET] on instance of model '%s' with id '%s' succeeded",
+            model,
+            id,
+        )
         return instance
 
+    async def get_many(
+        self,
+        ids: Sequence[int | str],
+        /,
+        *,
+        options: Sequence[ORMOption] | None = None,
+    ) -> Sequence[T]:
+        model = self.get_model()
+        primary_key = primary_key_column(model)
+        instances = await self.read(where=primary_key.in_(ids), options=options)
+        key = model.__mapper__.get_property_by_column(primary_key).key
+        found = {getattr(instance, key): instance for instance in instances}
+        missing = [id for id in ids if id not in found]
+        if missing:
+            header = f"DB operation [GET_MANY] on instances of model '{model}' with ids '{missing}'"
+            error_message = f"{header} failed because the instances were not found"
+            logger.error(error_message)
+            raise DoesNotExistError(error_message, ids=missing)
+        return [found[id] for id in ids]
+
+    async def exists(self, id: int | str, /) -> bool:
+        model = self.get_model()
+        query = exists_query(model)
+        return await self.async_session.scalar(query, {"id": id}) is not None
+
     async def read(
         self,
         *,
@@ -109,10 +221,10 @@ class AioGenericCRUD(AioCRUDInterface[T]):
         order_by: Any | None = None,
         skip: int = 0,
         take: int | None = None,
-    ) -> Generator[T, None, None]:
+        options: Sequence[ORMOption] | None = None,
+    ) -> Sequence[T]:
         model = self.get_model()
         query = select(model)
-        header = f"DB operation [READ] on model '{model}'"
         if where is not None:
             query = query.filter(where)
         if order_by is not None:
@@ -121,45 +233,155 @@ class AioGenericCRUD(AioCRUDInterface[T]):
             query = query.offset(skip)
         if take:
             query = query.limit(take)
+        if options is None:
+            options = self.default_options
+        if options:
+            query = query.options(*options)
         result = await self.async_session.execute(query)
-        items = (item for item in result.scalars())
-        logger.info(f"{header} succeeded")
+        items = result.scalars().all()
+        logger.info("DB operation [READ] on model '%s' succeeded", model)
         return items
 
-    async def update(self, id: int | str, /, **kwargs: Any) -> T:
+    async def read_one(
+        self, *, where: Any, options: Sequence[ORMOption] | None = None
+    ) -> T:
         model = self.get_model()
+        if options is None:
+            options = self.default_options
+        query = select(model).filter(where)
+        if options:
+            query = query.options(*options)
+        result = await self.async_session.scalars(query)
+        try:
+            instance = result.one_or_none()
+        except sqlalchemy.exc.MultipleResultsFound as error:
+            header = f"DB operation [READ_ONE] on model '{model}'"
+            error_message = f"{header} failed because more than one instance was found"
+            logger.error(error_message)
+            raise MultipleResultsError(error_message, where=where) from error
+        if instance is None:
+            header = f"DB operation [READ_ONE] on model '{model}'"
+            error_message = f"{header} failed because the instance was not found"
+            logger.error(error_message)
+            raise DoesNotExistError(error_message, where=where)
+        return instance
+
+    async def update(
+        self, id: int | str | tuple[Any, ...], /, *, lock: bool = False, **kwargs: Any
+    ) -> T:
+        if not kwargs and not lock:
+            return await self.get(id)
+        model = self.get_model()
+        with_for_update = {"nowait": True} if lock else None
         instance = await self.async_session.get(
-            model, id, with_for_update={"nowait": True}
+            model, id, options=self.default_options, with_for_update=with_for_update
         )
-        header = f"DB operation [UPDATE] on instance of model '{model}' with id '{id}'"
         if not instance:
+            header = (
+                f"DB operation [UPDATE] on instance of model '{model}' with id '{id}'"
+            )
             error_message = f"{header} failed because the instance was not found"
             logger.error(error_message)
             raise DoesNotExistError(error_message, id=id, **kwargs)
         instance.update(**kwargs)
         try:
-            self.async_session.add(instance)
             await self.async_session.flush()
-        except sqlalchemy.exc.IntegrityError as error:
-            error_message = f"{header} failed because of integrity constraints"
-            logger.error(error_message)
-            raise IntegrityError(error_message, **kwargs) from error
         except Exception as error:
+            header = (
+                f"DB operation [UPDATE] on instance of model '{model}' with id '{id}'"
+            )
+            if isinstance(error, sqlalchemy.exc.IntegrityError):
+                error_message = f"{header} failed because of integrity constraints"
+                logger.error(error_message)
+                raise IntegrityError(error_message, **kwargs) from error
             error_message = f"{header} failed because of unknow error"
             logger.error(error_message)
             raise UnknowError(error_message, **kwargs) from error
-        logger.info(f"{header} succeeded")
+        logger.info(
+            "DB operation [UPDATE] on instance of model '%s' with id '%s' succeeded",
+            model,
+            id,
+        )
         return instance
 
-    async def delete(self, id: int | str, /) -> T:
+    async def set_many_to_many(
+        self, instance: T, attr: str, ids: Iterable[int | str], /
+    ) -> None:
+        model = self.get_model()
+        parent_attr, delete_query, insert_query = many_to_many_queries(model, attr)
+        parent_id = getattr(instance, parent_attr)
+        rows = [{"parent_id": parent_id, "related_id": id} for id in ids]
+        try:
+            await self.async_session.flush()
+            await self.async_session.execute(delete_query, {"parent_id": parent_id})
+            if rows:
+                await self.async_session.execute(insert_query, rows)
+        except Exception as error:
+            header = f"DB operation [SET_MANY_TO_MANY] on relationship '{attr}' of model '{model}'"
+            if isinstance(error, sqlalchemy.exc.IntegrityError):
+                error_message = f"{header} failed because of integrity constraints"
+                logger.error(error_message)
+                raise IntegrityError(error_message) from error
+            error_message = f"{header} failed because of unknow error"
+            logger.error(error_message)
+            raise UnknowError(error_message) from error
+        self.async_session.expire(instance, [attr])
+        relationship = model.__mapper__.relationships[attr]
+        reverse_attrs = [prop.key for prop in relationship._reverse_property]
+        if reverse_attrs:
+            related_model = relationship.mapper.class_
+            for related in list(self.async_session.identity_map.values()):
+                if isinstance(related, related_model):
+                    self.async_session.expire(related, reverse_attrs)
+
+    async def delete(self, id: int | str | tuple[Any, ...], /) -> T:
         model = self.get_model()
-        instance = await self.get(id)
-        header = f"DB operation [DELETE] on instance {instance} of model '{model}' with id '{id}'"
+        dialect = self.async_session.get_bind().dialect
+        if (
+            model._get_dependent_relationships()
+            or len(model._get_primary_key()) > 1
+            or not dialect.delete_returning
+        ):
+            instance = await self.async_session.get(model, id)
+            if instance:
+                await self.async_session.delete(instance)
+                await self.async_session.flush()
+        else:
+            query = delete_returning_query(model)
+            result = await self.async_session.scalars(query, {"id": id})
+            instance = result.one_or_none()
+            if instance:
+                self.async_session.expunge(instance)
         if not instance:
+            header = (
+                f"DB operation [DELETE] on instance of model '{model}' with id '{id}'"
+            )
             error_message = f"{header} failed because the instance was not found"
             logger.error(error_message)
-            raise DoesNotExistError(error_message)
-        await self.async_session.delete(instance)
-        await self.async_session.flush()
-        logger.info(f"{header} succeeded")
+            raise DoesNotExistError(error_message, id=id)
+        logger.info(
+            "DB operation [DELETE] on instance '%s' of model '%s' with id '%s' succeeded",
+            instance,
+            model,
+            id,
+        )
         return instance
+
+    async def delete_by_id(self, id: int | str | tuple[Any, ...], /) -> None:
+        model = self.get_model()
+        if model._get_dependent_relationships() or len(model._get_primary_key()) > 1:
+            await self.delete(id)
+            return
+        result = await self.async_session.execute(delete_query(model), {"id": id})
+        if not cast(CursorResult[Any], result).rowcount:
+            header = (
+                f"DB operation [DELETE] on instance of model '{model}' with id '{id}'"
+            )
+            error_message = f"{header} failed because the instance was not found"
+            logger.error(error_message)
+            raise DoesNotExistError(error_message, id=id)
+        logger.info(
+            "DB operation [DELETE] on instance of model '%s' with id '%s' succeeded",
+            model,
+            id,
+        )
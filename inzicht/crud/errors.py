@@ -15,5 +15,9 @@ class IntegrityError(BaseORMError):
     pass
 
 
+class MultipleResultsError(BaseORMError):
+    pass
+
+
 class UnknowError(BaseORMError):
     pass
@@ -7,6 +7,21 @@ from sqlalchemy.orm import Session
 
 @contextmanager
 def session_factory(bind: Engine) -> Generator[Session, None, None]:
+    """
+    Open a Session on the given engine and run it in a single transaction.
+
+    The transaction is committed on exit and rolled back if an exception is raised.
+    Statements built by the CRUD classes have stable cache keys, so their compiled
+    form is reused from the engine's compiled cache; size it with
+    `create_engine(query_cache_size=...)` when an application issues many distinct
+    queries.
+
+    Args:
+        bind (Engine): The engine to bind the session to.
+
+    Yields:
+        Session: The session to run CRUD operations with.
+    """
     with Session(bind=bind, expire_on_commit=False) as session:
         try:
             session.begin()
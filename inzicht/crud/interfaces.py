@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from collections.abc import Generator, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any, Generic, TypeVar, overload
 
+from sqlalchemy.orm.interfaces import ORMOption
+
 from inzicht.declarative import DeclarativeBase
 
 T = TypeVar("T", bound=DeclarativeBase)
@@ -33,6 +35,20 @@ class CRUDInterface(ABC, Generic[T]):
             int: The total number of records in the collection.
         """
 
+    @abstractmethod
+    def count_many(self, conditions: Mapping[str, Any | None]) -> dict[str, int]:
+        """
+        Count records for several filter conditions with a single query.
+
+        Each condition becomes a `COUNT(CASE WHEN ... THEN 1 END)` column of the same SELECT.
+
+        Args:
+            conditions (Mapping[str, Any | None]): Filter conditions by name; `None` counts all records.
+
+        Returns:
+            dict[str, int]: The number of matching records by name.
+        """
+
     @overload
     @abstractmethod
     def create(self, instance: T, /) -> T:
@@ -57,29 +73,78 @@ class CRUDInterface(ABC, Generic[T]):
         """
 
     @abstractmethod
-    def bulk_create(self, instances: Sequence[T], /) -> Sequence[T]:
+    def bulk_create(
+        self, instances: Sequence[T] | Sequence[Mapping[str, Any]], /
+    ) -> Sequence[T]:
         """
         Create multiple records from the provided instances.
 
+        Mappings are inserted with a single INSERT ... RETURNING statement and do not go
+        through the unit of work, so they may contain column values only. As in `new()`, primary
+        key and version values given in a mapping are ignored. Instances are added to the session
+        and flushed, and are returned as passed in.
+
         Args:
-            instances (Sequence[T]): A sequence of items to be added to the database.
+            instances (Sequence[T] | Sequence[Mapping[str, Any]]): A sequence of items to be added to the database.
 
         Returns:
             Sequence[T]: A sequence of created records.
         """
 
     @abstractmethod
-    def get(self, id: int | str, /) -> T:
+    def get(
+        self,
+        id: int | str | tuple[Any, ...],
+        /,
+        *,
+        options: Sequence[ORMOption] | None = None,
+    ) -> T:
         """
         Retrieve a single record by its ID.
 
         Args:
-            id (int | str): The ID of the record to retrieve.
+            id (int | str | tuple[Any, ...]): The ID of the record to retrieve, or a tuple of values for a composite primary key.
+            options (Sequence[ORMOption], optional): Loader options, e.g. `selectinload(...)`, applied to the query. Defaults to `default_options` of the CRUD class.
 
         Returns:
             T: The record with the specified ID.
         """
 
+    @abstractmethod
+    def get_many(
+        self,
+        ids: Sequence[int | str],
+        /,
+        *,
+        options: Sequence[ORMOption] | None = None,
+    ) -> Sequence[T]:
+        """
+        Retrieve several records by their IDs with a single query.
+
+        The model must have a single-column primary key, otherwise TypeError is raised.
+
+        Args:
+            ids (Sequence[int | str]): The IDs of the records to retrieve.
+            options (Sequence[ORMOption], optional): Loader options, e.g. `selectinload(...)`, applied to the query. Defaults to `default_options` of the CRUD class.
+
+        Returns:
+            Sequence[T]: The records in the order of `ids`.
+        """
+
+    @abstractmethod
+    def exists(self, id: int | str, /) -> bool:
+        """
+        Check whether a record with the given ID exists without loading it.
+
+        The model must have a single-column primary key, otherwise TypeError is raised.
+
+        Args:
+            id (int | str): The ID of the record to look up.
+
+        Returns:
+            bool: True if the record exists, False otherwise.
+        """
+
     @abstractmethod
     def read(
         self,
@@ -88,7 +153,8 @@ class CRUDInterface(ABC, Generic[T]):
         order_by: Any | None = None,
         skip: int = 0,
         take: int | None = None,
-    ) -> Generator[T, None, None]:
+        options: Sequence[ORMOption] | None = None,
+    ) -> Sequence[T]:
         """
         Retrieve multiple records based on conditions.
 
@@ -97,32 +163,81 @@ class CRUDInterface(ABC, Generic[T]):
             order_by (Any, optional): Criteria to order the results.
             skip (int, optional): Number of records to skip. Defaults to 0.
             take (int, optional): Number of records to retrieve. Defaults to None which means no limit.
+            options (Sequence[ORMOption], optional): Loader options, e.g. `selectinload(...)`, applied to the query. Defaults to `default_options` of the CRUD class.
+
+        Returns:
+            Sequence[T]: A sequence of the retrieved records.
+        """
+
+    @abstractmethod
+    def read_one(self, *, where: Any, options: Sequence[ORMOption] | None = None) -> T:
+        """
+        Retrieve the single record matching the filter conditions.
+
+        No matching record raises `DoesNotExistError`, more than one raises `MultipleResultsError`.
+
+        Args:
+            where (Any): Filter conditions for retrieving the record.
+            options (Sequence[ORMOption], optional): Loader options, e.g. `selectinload(...)`, applied to the query. Defaults to `default_options` of the CRUD class.
 
         Returns:
-            Generator[T, None, None]: A generator of the retrieved records.
+            T: The matching record.
         """
 
     @abstractmethod
-    def update(self, id: int | str, /, **kwargs: Any) -> T:
+    def update(
+        self, id: int | str | tuple[Any, ...], /, *, lock: bool = False, **kwargs: Any
+    ) -> T:
         """
         Update a record by its ID with the provided payload.
 
         Args:
-            id (int | str): The ID of the record to update.
-            kwargs (Any): The attributes to update the record with.
+            id (int | str | tuple[Any, ...]): The ID of the record to update, or a tuple of values for a composite primary key.
+            lock (bool, optional): Lock the row with SELECT ... FOR UPDATE NOWAIT before updating, also when no attributes are given. Defaults to False, which takes no lock; concurrent updates are then only detected for models that declare a `version_id_col` in their mapper arguments.
+            kwargs (Any): The attributes to update the record with. The record is returned unchanged when none are given.
 
         Returns:
             T: The updated record.
         """
 
     @abstractmethod
-    def delete(self, id: int | str, /) -> T:
+    def set_many_to_many(
+        self, instance: T, attr: str, ids: Iterable[int | str], /
+    ) -> None:
+        """
+        Replace the related records of a many-to-many relationship.
+
+        The association rows of the instance are deleted and recreated with one DELETE
+        and one multi-row INSERT, instead of one statement per added or removed element.
+        The relationship attribute, and its reverse side on related records already in the
+        session, are expired so that they are reloaded on next access.
+
+        Args:
+            instance (T): The record whose relationship to replace.
+            attr (str): The name of the many-to-many relationship.
+            ids (Iterable[int | str]): The IDs of the records to relate to the instance.
+        """
+
+    @abstractmethod
+    def delete(self, id: int | str | tuple[Any, ...], /) -> T:
         """
         Delete a record by its ID.
 
         Args:
-            id (int | str): The ID of the record to delete.
+            id (int | str | tuple[Any, ...]): The ID of the record to delete, or a tuple of values for a composite primary key.
 
         Returns:
             T: The deleted record.
         """
+
+    @abstractmethod
+    def delete_by_id(self, id: int | str | tuple[Any, ...], /) -> None:
+        """
+        Delete a record by its ID without loading it.
+
+        Unlike `delete`, the deleted record is not returned, so on models without
+        dependent relationships this is a single DELETE statement on any dialect.
+
+        Args:
+            id (int | str | tuple[Any, ...]): The ID of the record to delete, or a tuple of values for a composite primary key.
+        """
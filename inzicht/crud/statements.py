@@ -0,0 +1,72 @@
+from functools import cache
+from typing import Any, TypeVar, cast
+
+from sqlalchemy import (
+    Column,
+    Select,
+    Table,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.sql.dml import Delete, Insert, ReturningDelete
+
+from inzicht.declarative import DeclarativeBase
+
+T = TypeVar("T", bound=DeclarativeBase)
+
+
+@cache
+def primary_key_column(model: type[DeclarativeBase]) -> Column[Any]:
+    primary_key = model.__mapper__.primary_key
+    if len(primary_key) != 1:
+        raise TypeError(
+            f"Model '{model}' must have a single-column primary key for this operation"
+        )
+    (column,) = primary_key
+    return cast(Column[Any], column)
+
+
+@cache
+def count_query(model: type[DeclarativeBase]) -> Select[tuple[int]]:
+    return select(func.count()).select_from(model)
+
+
+@cache
+def exists_query(model: type[DeclarativeBase]) -> Select[tuple[int]]:
+    primary_key = primary_key_column(model)
+    return select(literal(1)).where(primary_key == bindparam("id")).limit(1)
+
+
+@cache
+def delete_query(model: type[T]) -> Delete:
+    primary_key = primary_key_column(model)
+    return delete(model).where(primary_key == bindparam("id"))
+
+
+@cache
+def delete_returning_query(model: type[T]) -> ReturningDelete[tuple[T]]:
+    return delete_query(model).returning(model)
+
+
+@cache
+def many_to_many_queries(
+    model: type[DeclarativeBase], attr: str
+) -> tuple[str, Delete, Insert]:
+    relationship = model.__mapper__.relationships[attr]
+    if relationship.secondary is None:
+        raise ValueError(
+            f"Relationship '{attr}' of model '{model}' is not many-to-many"
+        )
+    secondary = cast(Table, relationship.secondary)
+    ((parent_column, parent_key),) = relationship.synchronize_pairs
+    ((_, related_key),) = relationship.secondary_synchronize_pairs or ()
+    parent_attr = model.__mapper__.get_property_by_column(parent_column).key
+    delete_query = delete(secondary).where(parent_key == bindparam("parent_id"))
+    insert_query = insert(secondary).values(
+        {parent_key: bindparam("parent_id"), related_key: bindparam("related_id")}
+    )
+    return parent_attr, delete_query, insert_query
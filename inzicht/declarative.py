@@ -1,6 +1,8 @@
+from functools import cache
 from typing import Any, ClassVar
 
 from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import MANYTOONE
 from sqlalchemy.orm import DeclarativeBase as OriginalBase
 from sqlalchemy.orm.mapper import Mapper
 from typing_extensions import Self
@@ -10,8 +12,9 @@ class InzichtBase:
     __mapper__: ClassVar[Mapper]
 
     @classmethod
-    def _get_primary_key(cls) -> list[str]:
-        primary_key = [c.name for c in cls.__mapper__.primary_key]
+    @cache
+    def _get_primary_key(cls) -> tuple[str, ...]:
+        primary_key = tuple(c.name for c in cls.__mapper__.primary_key)
         return primary_key
 
     @classmethod
@@ -19,29 +22,53 @@ class InzichtBase:
         columns = [c.name for c in cls.__mapper__.columns]
         return columns
 
+    @classmethod
+    @cache
+    def _get_safe_column_keys(cls) -> frozenset[str]:
+        mapper = cls.__mapper__
+        unsafe_columns = set(mapper.primary_key)
+        if mapper.version_id_col is not None:
+            unsafe_columns.add(mapper.version_id_col)
+        column_keys = frozenset(
+            attr.key
+            for attr in mapper.column_attrs
+            if not unsafe_columns & set(attr.columns)
+        )
+        return column_keys
+
     @classmethod
     def _get_relationships(cls) -> list[str]:
         relationships = [r.key for r in cls.__mapper__.relationships]
         return relationships
 
     @classmethod
-    def _get_attributes(cls) -> list[str]:
+    def _get_dependent_relationships(cls) -> list[str]:
+        relationships = [
+            r.key for r in cls.__mapper__.relationships if r.direction is not MANYTOONE
+        ]
+        return relationships
+
+    @classmethod
+    @cache
+    def _get_attributes(cls) -> frozenset[str]:
         primary_key = set(cls._get_primary_key())
         columns = set(cls._get_columns())
         relationships = set(cls._get_relationships())
         attributes = columns | relationships
-        safe_attributes = list(attributes - primary_key)
+        safe_attributes = frozenset(attributes - primary_key)
         return safe_attributes
 
     @classmethod
     def new(cls, **kwargs: Any) -> Self:
-        safe_kwargs = {k: v for k, v in kwargs.items() if k in cls._get_attributes()}
+        attributes = cls._get_attributes()
+        safe_kwargs = {k: v for k, v in kwargs.items() if k in attributes}
         return cls(**safe_kwargs)
 
     def update(self, **kwargs: Any) -> None:
-        safe_kwargs = {k: v for k, v in kwargs.items() if k in self._get_attributes()}
-        for k, v in safe_kwargs.items():
-            setattr(self, k, v)
+        attributes = self._get_attributes()
+        for k, v in kwargs.items():
+            if k in attributes:
+                setattr(self, k, v)
 
 
 class DeclarativeBase(AsyncAttrs, OriginalBase, InzichtBase):
@@ -1,18 +1,28 @@
+from sqlalchemy.orm import joinedload, selectinload
+
 from inzicht.aio.crud.generic import AioGenericCRUD
-from tests.models import Course, Group, Locker, Student
+from tests.models import Course, Dummy, Group, Locker, Student
 
 
 class AioCourseCRUD(AioGenericCRUD[Course]):
-    pass
+    default_options = (selectinload(Course.students),)
 
 
 class AioLockerCRUD(AioGenericCRUD[Locker]):
-    pass
+    default_options = (joinedload(Locker.student),)
 
 
 class AioGroupCRUD(AioGenericCRUD[Group]):
-    pass
+    default_options = (selectinload(Group.students),)
 
 
 class AioStudentCRUD(AioGenericCRUD[Student]):
+    default_options = (
+        joinedload(Student.group),
+        joinedload(Student.locker),
+        selectinload(Student.courses),
+    )
+
+
+class AioDummyCRUD(AioGenericCRUD[Dummy]):
     pass
@@ -1,3 +0,0 @@
-from typing import TypeAlias
-
-SideEffect: TypeAlias = None
@@ -1,45 +1,149 @@
 from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import Engine, StaticPool, create_engine
+from sqlalchemy import (
+    AsyncAdaptedQueuePool,
+    Connection,
+    Engine,
+    NullPool,
+    StaticPool,
+    create_engine,
+    event,
+    insert,
+)
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
 from inzicht import DeclarativeBase, session_factory
 from inzicht.aio.crud.factories import async_session_factory
-from tests.aio.crud import AioCourseCRUD, AioGroupCRUD, AioLockerCRUD, AioStudentCRUD
-from tests.crud import CourseCRUD, GroupCRUD, LockerCRUD, StudentCRUD
+from tests.crud import CourseCRUD, StudentCRUD
+from tests.models import Course, Group, Locker, Student, m2m_student_course
 
 
-@pytest.fixture(scope="function")
-def engine() -> Generator[Engine, None, None]:
+def truncate(connection: Connection) -> None:
+    for table in reversed(DeclarativeBase.metadata.sorted_tables):
+        connection.execute(table.delete())
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def disable_pysqlite_transactions(
+    dbapi_connection: Any, connection_record: Any
+) -> None:
+    dbapi_connection.isolation_level = None
+
+
+def begin_transaction(connection: Connection) -> None:
+    connection.exec_driver_sql("BEGIN")
+
+
+def reset(session: Session) -> None:
+    truncate(session.connection())
+    seed_content(session)
+
+
+@pytest.fixture(scope="session")
+def sample_titles() -> tuple[str, ...]:
+    return tuple(f"ABC_{index}" for index in range(0, 64))
+
+
+@pytest.fixture(scope="session")
+def database(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """
+    The file database behind the async engines. The seed content is loaded once when
+    it is created, so every async test starts from it; tests that commit through
+    `async_engine` have it restored afterwards.
+    """
+    database = tmp_path_factory.mktemp("db") / "inzicht.sqlite3"
+    engine = create_engine(url=f"sqlite+pysqlite:///{database}", poolclass=NullPool)
+    DeclarativeBase.metadata.create_all(bind=engine)
+    with session_factory(bind=engine) as session:
+        seed_content(session)
+    return f"{database}"
+
+
+@pytest.fixture(scope="session")
+def session_engine() -> Generator[Engine, None, None]:
+    """
+    The in-memory database behind the sync tests. The seed content is loaded once when
+    it is created, so every sync test starts from it; tests that commit through `engine`
+    have it restored afterwards, while tests using `session` roll their changes back.
+    """
     engine = create_engine(
-        url="sqlite:///:memory:",
+        url="sqlite+pysqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    metadata = DeclarativeBase.metadata
-    metadata.drop_all(bind=engine)
-    metadata.create_all(bind=engine)
+    event.listen(engine, "connect", disable_pysqlite_transactions)
+    event.listen(engine, "begin", begin_transaction)
+    DeclarativeBase.metadata.create_all(bind=engine)
+    with session_factory(bind=engine) as session:
+        seed_content(session)
     yield engine
+    engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def async_engine() -> AsyncGenerator[AsyncEngine, None]:
-    aengine = create_async_engine(url="sqlite+aiosqlite:///:memory:")
-    metadata = DeclarativeBase.metadata
-    async with aengine.begin() as connection:
-        await connection.run_sync(metadata.drop_all)
-        await connection.run_sync(metadata.create_all)
+@pytest.fixture(scope="function")
+def engine(session_engine: Engine) -> Generator[Engine, None, None]:
+    yield session_engine
+    with session_factory(bind=session_engine) as session:
+        reset(session)
+
 
+@pytest_asyncio.fixture(scope="session")
+async def session_async_engine(database: str) -> AsyncGenerator[AsyncEngine, None]:
+    aengine = create_async_engine(
+        url=f"sqlite+aiosqlite:///{database}",
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+    event.listen(aengine.sync_engine, "connect", set_sqlite_pragmas)
     yield aengine
+    await aengine.dispose()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def async_engine(
+    session_async_engine: AsyncEngine,
+) -> AsyncGenerator[AsyncEngine, None]:
+    yield session_async_engine
+    async with async_session_factory(bind=session_async_engine) as asession:
+        await asession.run_sync(reset)
 
 
 @pytest.fixture(scope="function")
-def session(engine: Engine) -> Generator[Session, None, None]:
-    with session_factory(bind=engine) as session:
-        yield session
+def session(session_engine: Engine) -> Generator[Session, None, None]:
+    with session_engine.connect() as connection:
+        transaction = connection.begin()
+        with Session(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+        transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+def course_crud(session: Session) -> CourseCRUD:
+    return CourseCRUD(session=session)
+
+
+@pytest.fixture(scope="function")
+def student_crud(session: Session) -> StudentCRUD:
+    return StudentCRUD(session=session)
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -50,123 +154,45 @@ async def async_session(
         yield asession
 
 
-@pytest.fixture(scope="function")
-def content(engine: Engine) -> None:
-    with session_factory(bind=engine) as session:
-        locker_crud = LockerCRUD(session=session)
-        course_crud = CourseCRUD(session=session)
-        group_crud = GroupCRUD(session=session)
-        student_crud = StudentCRUD(session=session)
-
-        lockers = [locker_crud.create(code=index) for index in range(1, 8)]
-        courses = [course_crud.create(title=f"Course_{index}") for index in range(1, 6)]
-        groups = [group_crud.create(title=index) for index in range(1, 3)]
-
-        students = [
-            {
-                "name": "S1_G1",
-                "group": groups[0],
-                "locker": lockers[0],
-                "courses": [courses[0], courses[1]],
-            },
-            {
-                "name": "S2_G1",
-                "group": groups[0],
-                "locker": lockers[1],
-                "courses": [courses[1]],
-            },
-            {
-                "name": "S3_G1",
-                "group": groups[0],
-                "locker": lockers[2],
-                "courses": [courses[1]],
-            },
+def seed_content(session: Session) -> None:
+    locker_ids = session.scalars(
+        insert(Locker).returning(Locker.id, sort_by_parameter_order=True),
+        [{"code": f"{index}"} for index in range(1, 8)],
+    ).all()
+    course_ids = session.scalars(
+        insert(Course).returning(Course.id, sort_by_parameter_order=True),
+        [{"title": f"Course_{index}"} for index in range(1, 6)],
+    ).all()
+    group_ids = session.scalars(
+        insert(Group).returning(Group.id, sort_by_parameter_order=True),
+        [{"title": f"{index}"} for index in range(1, 3)],
+    ).all()
+
+    students = [
+        ("S1_G1", 0, 0, [0, 1]),
+        ("S2_G1", 0, 1, [1]),
+        ("S3_G1", 0, 2, [1]),
+        ("S4_G1", 0, 3, [0]),
+        ("S5_G1", 0, 4, [0, 2]),
+        ("S1_G2", 1, 5, [0, 3]),
+        ("S2_G2", 1, 6, [0, 4]),
+    ]
+    student_ids = session.scalars(
+        insert(Student).returning(Student.id, sort_by_parameter_order=True),
+        [
             {
-                "name": "S4_G1",
-                "group": groups[0],
-                "locker": lockers[3],
-                "courses": [courses[0]],
-            },
-            {
-                "name": "S5_G1",
-                "group": groups[0],
-                "locker": lockers[4],
-                "courses": [courses[0], courses[2]],
-            },
-            {
-                "name": "S1_G2",
-                "group": groups[1],
-                "locker": lockers[5],
-                "courses": [courses[0], courses[3]],
-            },
-            {
-                "name": "S2_G2",
-                "group": groups[1],
-                "locker": lockers[6],
-                "courses": [courses[0], courses[4]],
-            },
-        ]
-        for student in students:
-            student_crud.create(**student)
-
-
-@pytest_asyncio.fixture
-async def async_content(async_engine: AsyncEngine) -> None:
-    async with async_session_factory(bind=async_engine) as asession:
-        locker_crud = AioLockerCRUD(async_session=asession)
-        course_crud = AioCourseCRUD(async_session=asession)
-        group_crud = AioGroupCRUD(async_session=asession)
-        student_crud = AioStudentCRUD(async_session=asession)
-
-        lockers = [await locker_crud.create(code=index) for index in range(1, 8)]
-        courses = [
-            await course_crud.create(title=f"Course_{index}") for index in range(1, 6)
-        ]
-        groups = [await group_crud.create(title=index) for index in range(1, 3)]
-
-        students = [
-            {
-                "name": "S1_G1",
-                "group": groups[0],
-                "locker": lockers[0],
-                "courses": [courses[0], courses[1]],
-            },
-            {
-                "name": "S2_G1",
-                "group": groups[0],
-                "locker": lockers[1],
-                "courses": [courses[1]],
-            },
-            {
-                "name": "S3_G1",
-                "group": groups[0],
-                "locker": lockers[2],
-                "courses": [courses[1]],
-            },
-            {
-                "name": "S4_G1",
-                "group": groups[0],
-                "locker": lockers[3],
-                "courses": [courses[0]],
-            },
-            {
-                "name": "S5_G1",
-                "group": groups[0],
-                "locker": lockers[4],
-                "courses": [courses[0], courses[2]],
-            },
-            {
-                "name": "S1_G2",
-                "group": groups[1],
-                "locker": lockers[5],
-                "courses": [courses[0], courses[3]],
-            },
-            {
-                "name": "S2_G2",
-                "group": groups[1],
-                "locker": lockers[6],
-                "courses": [courses[0], courses[4]],
-            },
-        ]
-        for student in students:
-            await student_crud.create(**student)
+                "name": name,
+                "group_id": group_ids[group],
+                "locker_id": locker_ids[locker],
+            }
+            for name, group, locker, _ in students
+        ],
+    ).all()
+    session.execute(
+        insert(m2m_student_course),
+        [
+            {"student_id": student_id, "course_id": course_ids[course]}
+            for student_id, (*_, courses) in zip(student_ids, students)
+            for course in courses
+        ],
+    )
@@ -1,21 +1,27 @@
+from sqlalchemy.orm import joinedload, selectinload
+
 from inzicht.crud.generic import GenericCRUD
 from tests.models import Course, Dummy, Group, Locker, Student
 
 
 class GroupCRUD(GenericCRUD[Group]):
-    pass
+    default_options = (selectinload(Group.students),)
 
 
 class StudentCRUD(GenericCRUD[Student]):
-    pass
+    default_options = (
+        joinedload(Student.group),
+        joinedload(Student.locker),
+        selectinload(Student.courses),
+    )
 
 
 class CourseCRUD(GenericCRUD[Course]):
-    pass
+    default_options = (selectinload(Course.students),)
 
 
 class LockerCRUD(GenericCRUD[Locker]):
-    pass
+    default_options = (joinedload(Locker.student),)
 
 
 class DummyCRUD(GenericCRUD[Dummy]):
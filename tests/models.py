@@ -1,4 +1,5 @@
 import datetime
+from typing import Any
 
 from sqlalchemy import (
     Column,
@@ -10,7 +11,7 @@ from sqlalchemy import (
     asc,
     text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 
 from inzicht.declarative import DeclarativeBase
 
@@ -27,6 +28,11 @@ class Base(DeclarativeBase):
     updated_on: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True), default=_now, onupdate=_now
     )
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"eager_defaults": True, "version_id_col": cls.__table__.c.version_id}
 
 
 m2m_student_course = Table(
@@ -51,7 +57,7 @@ class Group(Base):
     title: Mapped[str] = mapped_column(String(8), unique=True)
     students: Mapped[list["Student"]] = (
         relationship(  # Mapped[List[<model>]] -> one-to-many
-            back_populates="group", order_by=asc(text("students.id")), lazy="selectin"
+            back_populates="group", order_by=asc(text("students.id"))
         )
     )
 
@@ -64,15 +70,14 @@ class Student(Base):
 
     name: Mapped[str] = mapped_column(String(64), unique=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"))
-    group: Mapped["Group"] = relationship(back_populates="students", lazy="selectin")
+    group: Mapped["Group"] = relationship(back_populates="students")
     locker_id: Mapped[int] = mapped_column(ForeignKey("lockers.id"))
-    locker: Mapped["Locker"] = relationship(back_populates="student", lazy="selectin")
+    locker: Mapped["Locker"] = relationship(back_populates="student")
 
     courses: Mapped[list["Course"]] = relationship(
         secondary=m2m_student_course,  # many-to-many
         back_populates="students",
         order_by=asc(text("courses.id")),
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -88,7 +93,6 @@ class Course(Base):
         secondary=m2m_student_course,  # many-to-many
         back_populates="courses",
         order_by=asc(text("students.id")),
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -100,7 +104,7 @@ class Locker(Base):
 
     code: Mapped[str] = mapped_column(String(16))
     student: Mapped[Student] = relationship(
-        back_populates="locker", lazy="selectin"
+        back_populates="locker"
     )  # Mapped[<model>] -> one-to-one
 
     def __repr__(self) -> str:
@@ -113,3 +117,11 @@ class Dummy(Base):
     foo = mapped_column(String(8), unique=True, nullable=True)
     bar = mapped_column(String(8), unique=True, nullable=True)
     baz = mapped_column(String(8), unique=True, nullable=True)
+
+
+class Grade(DeclarativeBase):
+    __tablename__ = "grades"
+
+    student_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    course_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer)
@@ -1,46 +1,60 @@
 import asyncio
 import logging
+from collections.abc import Sequence
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlalchemy import and_, asc, desc, or_
+from sqlalchemy import and_, asc, desc, or_, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
-from sqlalchemy.sql.elements import BinaryExpression
 
 from inzicht import AioGenericCRUD
 from inzicht.aio.crud.factories import async_session_factory
 from inzicht.crud.errors import DoesNotExistError, IntegrityError
-from tests.aio.crud import AioCourseCRUD, AioGroupCRUD, AioLockerCRUD, AioStudentCRUD
-from tests.aliases import SideEffect
+from tests.aio.crud import (
+    AioCourseCRUD,
+    AioDummyCRUD,
+    AioGroupCRUD,
+    AioLockerCRUD,
+    AioStudentCRUD,
+)
 from tests.models import Course, Group, Student
 
 logging.getLogger("aio.crud.generic").setLevel(logging.CRITICAL)
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "where, expected",
-    [
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_count_records(async_session: AsyncSession) -> None:
+    course_crud = AioCourseCRUD(async_session=async_session)
+
+    cases = [
         (None, 5),
         (Course.id == 1, 1),
         (Course.title == "Course_1", 1),
         (or_(Course.title == "Course_1", Course.title == "Course_2"), 2),
         (and_(Course.title == "Course_1", Course.title == "Course_2"), 0),
-    ],
-)
-async def test_if_can_async_count_records(
+    ]
+    counts = [await course_crud.count(where=where) for where, _ in cases]
+    assert counts == [expected for _, expected in cases]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_count_records_in_single_query(
     async_session: AsyncSession,
-    async_content: SideEffect,
-    where: BinaryExpression | None,
-    expected: int,
 ) -> None:
     course_crud = AioCourseCRUD(async_session=async_session)
 
-    count = await course_crud.count(where=where)
-    assert count == expected
+    counts = await course_crud.count_many(
+        {
+            "all": None,
+            "by_id": Course.id == 1,
+            "by_titles": or_(Course.title == "Course_1", Course.title == "Course_2"),
+            "none": and_(Course.title == "Course_1", Course.title == "Course_2"),
+        }
+    )
+    assert counts == {"all": 5, "by_id": 1, "by_titles": 2, "none": 0}
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_error_when_creating_instance_with_invalid_args(
     async_session: AsyncSession,
 ) -> None:
@@ -56,16 +70,18 @@ async def test_if_async_raises_error_when_creating_instance_with_invalid_args(
     )
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_create_single_record(async_session: AsyncSession) -> None:
     group_crud = AioGroupCRUD(async_session=async_session)
 
     created = await group_crud.create(title="ABC")
-    assert all([created.id, created.created_on, created.updated_on])
+    assert created.id is not None
+    assert created.created_on is not None
+    assert created.updated_on is not None
     assert created.title == "ABC"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_create_single_record_from_object(
     async_session: AsyncSession,
 ) -> None:
@@ -73,79 +89,112 @@ async def test_if_can_async_create_single_record_from_object(
     group_crud = AioGroupCRUD(async_session=async_session)
 
     created = await group_crud.create(group)
-    assert all([created.id, created.created_on, created.updated_on])
+    assert created.id is not None
+    assert created.created_on is not None
+    assert created.updated_on is not None
     assert created.title == "ABC"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_create_multiple_records_sequentially(
     async_session: AsyncSession,
+    sample_titles: tuple[str, ...],
 ) -> None:
     group_crud = AioGroupCRUD(async_session=async_session)
 
-    requested = [{"title": f"ABC_{index}"} for index in range(0, 64)]
+    requested = [{"title": title} for title in sample_titles[:8]]
     created = []
     for item in requested:
         group = await group_crud.create(**item)
         created.append(group)
 
     for requested_item, created_item in zip(requested, created):
-        assert all([created_item.id, created_item.created_on, created_item.updated_on])
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
         assert created_item.title == requested_item["title"]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_create_multiple_records_concurrently(
-    async_session: AsyncSession,
+    async_engine: AsyncEngine,
+    sample_titles: tuple[str, ...],
 ) -> None:
-    group_crud = AioGroupCRUD(async_session=async_session)
+    async def create(items: list[dict[str, str]]) -> Sequence[Group]:
+        async with async_session_factory(bind=async_engine) as async_session:
+            return await AioGroupCRUD(async_session=async_session).bulk_create(items)
 
-    requested = [{"title": f"ABC_{index}"} for index in range(0, 64)]
+    requested = [{"title": title} for title in sample_titles]
+    batches = [requested[index : index + 16] for index in range(0, 64, 16)]
 
-    created = await asyncio.gather(*[group_crud.create(**item) for item in requested])
+    created = [
+        group
+        for groups in await asyncio.gather(*[create(batch) for batch in batches])
+        for group in groups
+    ]
 
     for requested_item, created_item in zip(requested, created):
-        assert all([created_item.id, created_item.created_on, created_item.updated_on])
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
         assert created_item.title == requested_item["title"]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_bulk_create_multiple_records(
     async_session: AsyncSession,
+    sample_titles: tuple[str, ...],
 ) -> None:
     group_crud = AioGroupCRUD(async_session=async_session)
 
-    required = [Group(title=f"ABC_{index}") for index in range(0, 64)]
+    required = [Group(title=title) for title in sample_titles]
     created = await group_crud.bulk_create(required)
     for required_item, created_item in zip(required, created):
-        assert all([created_item.id, created_item.created_on, created_item.updated_on])
+        assert created_item is required_item
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
         assert created_item.title == required_item.title
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_read_single_record(
-    async_session: AsyncSession, async_content: SideEffect
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_bulk_create_multiple_records_from_mappings(
+    async_session: AsyncSession,
+    sample_titles: tuple[str, ...],
 ) -> None:
+    group_crud = AioGroupCRUD(async_session=async_session)
+
+    required = [{"id": 1024, "title": title} for title in sample_titles]
+    created = await group_crud.bulk_create(required)
+    assert len(created) == len(required)
+    for required_item, created_item in zip(required, created):
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
+        assert created_item.id != required_item["id"]
+        assert created_item.title == required_item["title"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_read_single_record(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.get(1)
     assert retrieved.id == 1
+    assert await student_crud.exists(1)
+    assert not await student_crud.exists(-1)
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_read_multiple_records(
-    async_session: AsyncSession, async_content: SideEffect
-) -> None:
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_read_multiple_records(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.read()
-    assert {item.id for item in retrieved} == {1, 2, 3, 4, 5, 6, 7}
+    assert sorted(item.id for item in retrieved) == [1, 2, 3, 4, 5, 6, 7]
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_sort_records(
-    async_session: AsyncSession, async_content: SideEffect
-) -> None:
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_sort_records(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.read(order_by=asc(Student.id))
@@ -154,24 +203,26 @@ async def test_if_can_async_sort_records(
     retrieved = await student_crud.read(order_by=desc(Student.id))
     assert [item.id for item in retrieved] == [7, 6, 5, 4, 3, 2, 1]
 
+    retrieved = await student_crud.read(order_by="name")
+    assert [item.id for item in retrieved] == [1, 6, 2, 7, 3, 4, 5]
 
-@pytest.mark.asyncio
-async def test_if_can_async_limit_records(
-    async_session: AsyncSession, async_content: SideEffect
-) -> None:
+    retrieved = await student_crud.read(order_by=text("students.id desc"))
+    assert [item.id for item in retrieved] == [7, 6, 5, 4, 3, 2, 1]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_limit_records(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.read(take=1)
-    assert {item.id for item in retrieved} == {1}
+    assert sorted(item.id for item in retrieved) == [1]
 
     retrieved = await student_crud.read(take=5)
-    assert {item.id for item in retrieved} == {1, 2, 3, 4, 5}
+    assert sorted(item.id for item in retrieved) == [1, 2, 3, 4, 5]
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_offset_records(
-    async_session: AsyncSession, async_content: SideEffect
-) -> None:
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_offset_records(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.read(skip=2, take=2, order_by=asc(Student.id))
@@ -181,24 +232,19 @@ async def test_if_can_async_offset_records(
     assert [item.id for item in retrieved] == [5, 4]
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_filter_records(
-    async_session: AsyncSession, async_content: SideEffect
-) -> None:
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_filter_records(async_session: AsyncSession) -> None:
     student_crud = AioStudentCRUD(async_session=async_session)
 
     retrieved = await student_crud.read(where=Student.id > 4)
-    assert {item.id for item in retrieved} == {5, 6, 7}
+    assert sorted(item.id for item in retrieved) == [5, 6, 7]
 
     retrieved = await student_crud.read(where=or_(Student.id == 1, Student.id == 1024))
-    assert {item.id for item in retrieved} == {1}
+    assert sorted(item.id for item in retrieved) == [1]
 
-    retrieved = await student_crud.read(
+    instance = await student_crud.read_one(
         where=and_(Student.id == 1, Student.name == "S1_G1")
     )
-    instances = list(retrieved)
-    assert len(instances) == 1
-    instance = instances[0]
     assert instance.id == 1
     assert instance.name == "S1_G1"
 
@@ -208,13 +254,12 @@ async def test_if_can_async_filter_records(
     assert [item.id for item in retrieved] == [1, 7]
 
     retrieved = await student_crud.read(
-        where=Student.group.has(Group.title.in_(["2", "1024"]))
+        where=Student.group.has(Group.title.in_(["2", "1024"])), options=[]
     )
-
-    assert all([instance.group.title == "2" for instance in retrieved])
+    assert sorted(item.id for item in retrieved) == [6, 7]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_update_record(async_engine: AsyncEngine) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         created = await AioGroupCRUD(async_session=async_session).create(title="ABC")
@@ -238,10 +283,39 @@ async def test_if_can_async_update_record(async_engine: AsyncEngine) -> None:
     assert updated.updated_on >= created.updated_on
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_update_via_attributes(
-    async_engine: AsyncEngine, async_content: SideEffect
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_update_record_with_lock(async_engine: AsyncEngine) -> None:
+    async with async_session_factory(bind=async_engine) as async_session:
+        created = await AioGroupCRUD(async_session=async_session).create(title="ABC")
+
+    async with async_session_factory(bind=async_engine) as async_session:
+        updated = await AioGroupCRUD(async_session=async_session).update(
+            created.id, lock=True, title="DEF"
+        )
+
+    assert updated.id == created.id
+    assert updated.title == "DEF"
+    assert updated.version_id == created.version_id + 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_skip_update_given_empty_payload(
+    async_engine: AsyncEngine,
 ) -> None:
+    async with async_session_factory(bind=async_engine) as async_session:
+        created = await AioGroupCRUD(async_session=async_session).create(title="ABC")
+
+    async with async_session_factory(bind=async_engine) as async_session:
+        updated = await AioGroupCRUD(async_session=async_session).update(created.id)
+
+    assert updated.id == created.id
+    assert updated.title == "ABC"
+    assert updated.updated_on == created.updated_on
+    assert updated.version_id == created.version_id
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_update_via_attributes(async_engine: AsyncEngine) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         student = await AioStudentCRUD(async_session=async_session).get(1)
 
@@ -251,8 +325,7 @@ async def test_if_can_async_update_via_attributes(
 
     async with async_session_factory(bind=async_engine) as async_session:
         course_crud = AioCourseCRUD(async_session=async_session)
-        course_1 = await course_crud.get(1)
-        course_5 = await course_crud.get(5)
+        course_1, course_5 = await course_crud.get_many([1, 5])
 
         student_crud = AioStudentCRUD(async_session=async_session)
         student = await student_crud.get(1)
@@ -273,9 +346,60 @@ async def test_if_can_async_update_via_attributes(
         assert student.updated_on > student.created_on
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_update_related_collection(
+    async_session: AsyncSession,
+) -> None:
+    course = await AioCourseCRUD(async_session=async_session).get(5)
+
+    student_crud = AioStudentCRUD(async_session=async_session)
+    updated = await student_crud.update(1, courses=[course])
+    assert [item.id for item in updated.courses] == [5]
+
+    async_session.expire_all()
+    student = await student_crud.get(1)
+    assert [item.id for item in student.courses] == [5]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_expire_reverse_side_when_setting_many_to_many_related_field(
+    async_session: AsyncSession,
+) -> None:
+    course_crud = AioCourseCRUD(async_session=async_session)
+    course_2, course_5 = await course_crud.get_many([2, 5])
+    assert 1 in {student.id for student in course_2.students}
+
+    student_crud = AioStudentCRUD(async_session=async_session)
+    student = await student_crud.get(1)
+    await student_crud.set_many_to_many(student, "courses", [5])
+
+    students = await course_2.awaitable_attrs.students
+    assert 1 not in {student.id for student in students}
+    students = await course_5.awaitable_attrs.students
+    assert 1 in {student.id for student in students}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_set_many_to_many_related_field(
+    async_engine: AsyncEngine,
+) -> None:
+    async with async_session_factory(bind=async_engine) as async_session:
+        student_crud = AioStudentCRUD(async_session=async_session)
+        student = await student_crud.get(1)
+        await student_crud.set_many_to_many(student, "courses", [2, 5])
+
+        courses = await student.awaitable_attrs.courses
+        assert {course.id for course in courses} == {2, 5}
+
+    async with async_session_factory(bind=async_engine) as async_session:
+        student = await AioStudentCRUD(async_session=async_session).get(1)
+
+        assert {course.id for course in student.courses} == {2, 5}
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_get_one_to_one_related_field(
-    async_engine: AsyncEngine, async_content: SideEffect
+    async_engine: AsyncEngine,
 ) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         student = await AioStudentCRUD(async_session=async_session).get(1)
@@ -288,9 +412,9 @@ async def test_if_can_async_get_one_to_one_related_field(
         assert locker.student.id == 1
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_get_one_to_many_related_field(
-    async_engine: AsyncEngine, async_content: SideEffect
+    async_engine: AsyncEngine,
 ) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         group = await AioGroupCRUD(async_session=async_session).get(1)
@@ -298,9 +422,9 @@ async def test_if_can_async_get_one_to_many_related_field(
         assert {student.id for student in group.students} == {1, 2, 3, 4, 5}
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_get_many_to_many_related_field(
-    async_engine: AsyncEngine, async_content: SideEffect
+    async_engine: AsyncEngine,
 ) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         student = await AioStudentCRUD(async_session=async_session).get(1)
@@ -313,10 +437,8 @@ async def test_if_can_async_get_many_to_many_related_field(
         assert {student.id for student in course.students} == {1, 4, 5, 6, 7}
 
 
-@pytest.mark.asyncio
-async def test_if_can_async_delete_record(
-    async_engine: AsyncEngine, async_content: SideEffect
-) -> None:
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_delete_record(async_engine: AsyncEngine) -> None:
     async with async_session_factory(bind=async_engine) as async_session:
         course_crud = AioCourseCRUD(async_session=async_session)
 
@@ -333,7 +455,45 @@ async def test_if_can_async_delete_record(
         assert count == 4
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_delete_record_in_single_statement(
+    async_session: AsyncSession,
+) -> None:
+    dummy_crud = AioDummyCRUD(async_session=async_session)
+    created = await dummy_crud.create(foo="spam")
+
+    deleted = await dummy_crud.delete(created.id)
+    assert deleted.id == created.id
+    assert deleted.foo == "spam"
+
+    with pytest.raises(DoesNotExistError):
+        await dummy_crud.get(created.id)
+
+    with pytest.raises(DoesNotExistError) as error:
+        await dummy_crud.delete(created.id)
+
+    assert error.value.kwargs == dict(id=created.id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_delete_record_by_id(async_session: AsyncSession) -> None:
+    dummy_crud = AioDummyCRUD(async_session=async_session)
+    created = await dummy_crud.create(foo="spam")
+
+    await dummy_crud.delete_by_id(created.id)
+    assert await dummy_crud.count() == 0
+
+    course_crud = AioCourseCRUD(async_session=async_session)
+    await course_crud.delete_by_id(1)
+    assert await course_crud.count() == 4
+
+    with pytest.raises(DoesNotExistError) as error:
+        await dummy_crud.delete_by_id(created.id)
+
+    assert error.value.kwargs == dict(id=created.id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_can_async_rollback_transaction_when_error_occurs(
     async_engine: AsyncEngine,
 ) -> None:
@@ -354,9 +514,22 @@ async def test_if_can_async_rollback_transaction_when_error_occurs(
         session_mock.rollback.assert_called_once()
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
+async def test_if_can_async_get_multiple_records(async_session: AsyncSession) -> None:
+    student_crud = AioStudentCRUD(async_session=async_session)
+
+    retrieved = await student_crud.get_many([7, 1, 4])
+    assert [item.id for item in retrieved] == [7, 1, 4]
+
+    with pytest.raises(DoesNotExistError) as error:
+        await student_crud.get_many([1, 42, 1024])
+
+    assert error.value.kwargs == dict(ids=[42, 1024])
+
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_error_when_reading_nonexistent_instance(
-    async_session: AsyncSession, async_content: SideEffect
+    async_session: AsyncSession,
 ) -> None:
     with pytest.raises(DoesNotExistError) as error:
         group_crud = AioGenericCRUD[Group](async_session=async_session)
@@ -368,7 +541,7 @@ async def test_if_async_raises_error_when_reading_nonexistent_instance(
     )
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_integrity_error_when_creating_single_instance_given_unique_constraint_violated(
     async_engine: AsyncEngine,
 ) -> None:
@@ -382,7 +555,7 @@ async def test_if_async_raises_integrity_error_when_creating_single_instance_giv
             await group_crud.create(title="foo_bar_baz")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_integrity_error_when_creating_multiple_instances_given_unique_constraint_violated(
     async_engine: AsyncEngine,
 ) -> None:
@@ -394,9 +567,9 @@ async def test_if_async_raises_integrity_error_when_creating_multiple_instances_
             )
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_error_when_updating_nonexistent_instance(
-    async_session: AsyncSession, async_content: SideEffect
+    async_session: AsyncSession,
 ) -> None:
     with pytest.raises(DoesNotExistError) as error:
         group_crud = AioGenericCRUD[Group](async_session=async_session)
@@ -408,7 +581,7 @@ async def test_if_async_raises_error_when_updating_nonexistent_instance(
     )
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_integrity_error_when_updating_instance_given_unique_constraint_violated(
     async_engine: AsyncEngine,
 ) -> None:
@@ -423,9 +596,9 @@ async def test_if_async_raises_integrity_error_when_updating_instance_given_uniq
             await group_crud.update(g2.id, title="foo_bar_baz_1")
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_if_async_raises_error_when_deleting_nonexistent_instance(
-    async_session: AsyncSession, async_content: SideEffect
+    async_session: AsyncSession,
 ) -> None:
     with pytest.raises(DoesNotExistError) as error:
         group_crud = AioGenericCRUD[Group](async_session=async_session)
@@ -433,5 +606,5 @@ async def test_if_async_raises_error_when_deleting_nonexistent_instance(
 
     assert (
         str(error.value)
-        == "DB operation [GET] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
+        == "DB operation [DELETE] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
     )
@@ -19,6 +19,39 @@ def test_if_can_get_model(type_parameter: Any, session: Session) -> None:
     assert crud.get_model() is type_parameter
 
 
+def test_if_can_reuse_parametrized_class() -> None:
+    assert GenericCRUD[Group] is GenericCRUD[Group]
+    assert GenericCRUD[Group] is not GenericCRUD[Student]
+    assert issubclass(GenericCRUD[Group], GenericCRUD)
+
+
+def test_if_raises_error_when_getting_model_of_unparametrized_class(
+    session: Session,
+) -> None:
+    with pytest.raises(TypeError):
+        GenericCRUD(session=session).get_model()
+
+
+def test_if_can_get_model_of_subclass_with_several_bases(session: Session) -> None:
+    class Mixin:
+        pass
+
+    class GroupCRUD(Mixin, GenericCRUD[Group]):
+        pass
+
+    class ChildGroupCRUD(GroupCRUD):
+        pass
+
+    assert GroupCRUD(session=session).get_model() is Group
+    assert ChildGroupCRUD(session=session).get_model() is Group
+
+
+@pytest.mark.parametrize("model", [Group, Student, Course, Locker, Dummy])
+def test_if_can_cache_primary_key_of_model(model: Any) -> None:
+    assert model._get_primary_key() == ("id",)
+    assert model._get_primary_key() is model._get_primary_key()
+
+
 @pytest.mark.parametrize(
     "attrs,expected",
     [
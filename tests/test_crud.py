@@ -1,42 +1,48 @@
 import logging
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable
+from typing import Any
 
 import pytest
-from sqlalchemy import Engine, and_, asc, desc, or_
-from sqlalchemy.orm import Session
-from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy import Engine, and_, asc, desc, or_, text
+from sqlalchemy.orm import Session, selectinload
 
 from inzicht import GenericCRUD, session_factory
-from inzicht.crud.errors import DoesNotExistError, IntegrityError
-from tests.aliases import SideEffect
+from inzicht.crud.errors import DoesNotExistError, IntegrityError, MultipleResultsError
 from tests.crud import (
     CourseCRUD,
+    DummyCRUD,
     GroupCRUD,
     LockerCRUD,
     StudentCRUD,
 )
-from tests.models import Course, Group, Student
+from tests.models import Course, Grade, Group, Student
 
 logging.getLogger("crud.generic").setLevel(logging.CRITICAL)
 
 
-@pytest.mark.parametrize(
-    "where, expected",
-    [
+def test_if_can_count_records(course_crud: CourseCRUD) -> None:
+    cases = [
         (None, 5),
         (Course.id == 1, 1),
         (Course.title == "Course_1", 1),
         (or_(Course.title == "Course_1", Course.title == "Course_2"), 2),
         (and_(Course.title == "Course_1", Course.title == "Course_2"), 0),
-    ],
-)
-def test_if_can_count_records(
-    session: Session, content: SideEffect, where: BinaryExpression | None, expected: int
-) -> None:
-    course_crud = CourseCRUD(session=session)
-
-    count = course_crud.count(where=where)
-    assert count == expected
+    ]
+    counts = [course_crud.count(where=where) for where, _ in cases]
+    assert counts == [expected for _, expected in cases]
+
+
+def test_if_can_count_records_in_single_query(course_crud: CourseCRUD) -> None:
+    counts = course_crud.count_many(
+        {
+            "all": None,
+            "by_id": Course.id == 1,
+            "by_titles": or_(Course.title == "Course_1", Course.title == "Course_2"),
+            "none": and_(Course.title == "Course_1", Course.title == "Course_2"),
+        }
+    )
+    assert counts == {"all": 5, "by_id": 1, "by_titles": 2, "none": 0}
+    assert course_crud.count_many({}) == {}
 
 
 def test_if_raises_error_when_creating_instance_with_invalid_args(
@@ -58,7 +64,9 @@ def test_if_can_create_single_record(session: Session) -> None:
     group_crud = GroupCRUD(session=session)
 
     created = group_crud.create(title="ABC")
-    assert all([created.id, created.created_on, created.updated_on])
+    assert created.id is not None
+    assert created.created_on is not None
+    assert created.updated_on is not None
     assert created.title == "ABC"
 
 
@@ -67,67 +75,104 @@ def test_if_can_create_single_record_from_object(session: Session) -> None:
     group_crud = GroupCRUD(session=session)
 
     created = group_crud.create(group)
-    assert all([created.id, created.created_on, created.updated_on])
+    assert created.id is not None
+    assert created.created_on is not None
+    assert created.updated_on is not None
     assert created.title == "ABC"
 
 
-def test_if_can_create_multiple_records(session: Session) -> None:
+def test_if_can_create_multiple_records(
+    session: Session, sample_titles: tuple[str, ...]
+) -> None:
     group_crud = GroupCRUD(session=session)
 
-    required = [{"title": f"ABC_{index}"} for index in range(0, 64)]
+    required = [{"title": title} for title in sample_titles[:8]]
     created = [group_crud.create(**item) for item in required]
     for required_item, created_item in zip(required, created):
-        assert all([created_item.id, created_item.created_on, created_item.updated_on])
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
         assert created_item.title == required_item["title"]
 
 
-def test_if_can_bulk_create_multiple_records(session: Session) -> None:
+def test_if_can_bulk_create_multiple_records(
+    session: Session, sample_titles: tuple[str, ...]
+) -> None:
     group_crud = GroupCRUD(session=session)
 
-    required = [Group(title=f"ABC_{index}") for index in range(0, 64)]
+    required = [Group(title=title) for title in sample_titles]
     created = group_crud.bulk_create(required)
     for required_item, created_item in zip(required, created):
-        assert all([created_item.id, created_item.created_on, created_item.updated_on])
+        assert created_item is required_item
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
         assert created_item.title == required_item.title
 
+    assert group_crud.bulk_create([]) == []
 
-def test_if_can_read_single_record(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
 
+def test_if_can_bulk_create_records_with_assigned_primary_key(session: Session) -> None:
+    group_crud = GroupCRUD(session=session)
+
+    required = [Group(id=4096, title="ABC"), Group(id=4097, title="DEF")]
+    created = group_crud.bulk_create(required)
+    assert [item.id for item in created] == [4096, 4097]
+    assert [item.title for item in group_crud.get_many([4096, 4097])] == ["ABC", "DEF"]
+
+
+def test_if_can_bulk_create_multiple_records_from_mappings(
+    session: Session, sample_titles: tuple[str, ...]
+) -> None:
+    group_crud = GroupCRUD(session=session)
+
+    required = [
+        {"id": 1024, "version_id": 7, "title": title} for title in sample_titles
+    ]
+    created = group_crud.bulk_create(required)
+    assert len(created) == len(required)
+    for required_item, created_item in zip(required, created):
+        assert created_item.id is not None
+        assert created_item.created_on is not None
+        assert created_item.updated_on is not None
+        assert created_item.id != required_item["id"]
+        assert created_item.version_id == 1
+        assert created_item.title == required_item["title"]
+
+
+def test_if_can_read_single_record(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.get(1)
     assert retrieved.id == 1
 
 
-def test_if_can_read_multiple_records(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
-
+def test_if_can_read_multiple_records(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.read()
-    assert {item.id for item in retrieved} == {1, 2, 3, 4, 5, 6, 7}
+    assert sorted(item.id for item in retrieved) == [1, 2, 3, 4, 5, 6, 7]
 
 
-def test_if_can_sort_records(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
-
+def test_if_can_sort_records(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.read(order_by=asc(Student.id))
     assert [item.id for item in retrieved] == [1, 2, 3, 4, 5, 6, 7]
 
     retrieved = student_crud.read(order_by=desc(Student.id))
     assert [item.id for item in retrieved] == [7, 6, 5, 4, 3, 2, 1]
 
+    retrieved = student_crud.read(order_by="name")
+    assert [item.id for item in retrieved] == [1, 6, 2, 7, 3, 4, 5]
+
+    retrieved = student_crud.read(order_by=text("students.id desc"))
+    assert [item.id for item in retrieved] == [7, 6, 5, 4, 3, 2, 1]
 
-def test_if_can_limit_records(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
 
+def test_if_can_limit_records(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.read(take=1)
-    assert {item.id for item in retrieved} == {1}
+    assert sorted(item.id for item in retrieved) == [1]
 
     retrieved = student_crud.read(take=5)
-    assert {item.id for item in retrieved} == {1, 2, 3, 4, 5}
+    assert sorted(item.id for item in retrieved) == [1, 2, 3, 4, 5]
 
 
-def test_if_can_offset_records(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
-
+def test_if_can_offset_records(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.read(skip=2, take=2, order_by=asc(Student.id))
     assert [item.id for item in retrieved] == [3, 4]
 
@@ -135,19 +180,16 @@ def test_if_can_offset_records(session: Session, content: SideEffect) -> None:
     assert [item.id for item in retrieved] == [5, 4]
 
 
-def test_if_can_filter_records(session: Session, content: SideEffect) -> None:
-    student_crud = StudentCRUD(session=session)
-
+def test_if_can_filter_records(student_crud: StudentCRUD) -> None:
     retrieved = student_crud.read(where=Student.id > 4)
-    assert {item.id for item in retrieved} == {5, 6, 7}
+    assert sorted(item.id for item in retrieved) == [5, 6, 7]
 
     retrieved = student_crud.read(where=or_(Student.id == 1, Student.id == 1024))
-    assert {item.id for item in retrieved} == {1}
+    assert sorted(item.id for item in retrieved) == [1]
 
-    retrieved = student_crud.read(where=and_(Student.id == 1, Student.name == "S1_G1"))
-    instances = list(retrieved)
-    assert len(instances) == 1
-    instance = instances[0]
+    instance = student_crud.read_one(
+        where=and_(Student.id == 1, Student.name == "S1_G1")
+    )
     assert instance.id == 1
     assert instance.name == "S1_G1"
 
@@ -157,9 +199,40 @@ def test_if_can_filter_records(session: Session, content: SideEffect) -> None:
     assert [item.id for item in retrieved] == [1, 7]
 
     retrieved = student_crud.read(
-        where=Student.group.has(Group.title.in_(["2", "1024"]))
+        where=Student.group.has(Group.title.in_(["2", "1024"])), options=[]
     )
-    assert all([instance.group.title == "2" for instance in retrieved])
+    assert sorted(item.id for item in retrieved) == [6, 7]
+
+
+def test_if_raises_error_when_reading_one_nonexistent_instance(
+    student_crud: StudentCRUD,
+) -> None:
+    where = Student.name == "foo"
+    with pytest.raises(DoesNotExistError) as error:
+        student_crud.read_one(where=where)
+
+    assert error.value.kwargs["where"] is where
+
+
+def test_if_raises_error_when_reading_one_of_multiple_instances(
+    student_crud: StudentCRUD,
+) -> None:
+    where = Student.id > 4
+    with pytest.raises(MultipleResultsError) as error:
+        student_crud.read_one(where=where)
+
+    assert error.value.kwargs["where"] is where
+
+
+def test_if_can_eager_load_related_fields(session: Session) -> None:
+    student_crud = StudentCRUD(session=session)
+
+    student = student_crud.get(1, options=[selectinload(Student.courses)])
+    assert "courses" in student.__dict__
+    assert "locker" not in student.__dict__
+
+    retrieved = student_crud.read(options=[selectinload(Student.locker)])
+    assert all("locker" in instance.__dict__ for instance in retrieved)
 
 
 def test_if_can_update_record(engine: Engine) -> None:
@@ -183,7 +256,49 @@ def test_if_can_update_record(engine: Engine) -> None:
     assert updated.updated_on >= created.updated_on
 
 
-def test_if_can_update_via_attributes(engine: Engine, content: SideEffect) -> None:
+def test_if_can_update_record_with_lock(engine: Engine) -> None:
+    with session_factory(bind=engine) as session:
+        created = GroupCRUD(session=session).create(title="ABC")
+
+    with session_factory(bind=engine) as session:
+        updated = GroupCRUD(session=session).update(created.id, lock=True, title="DEF")
+
+    assert updated.id == created.id
+    assert updated.title == "DEF"
+    assert updated.version_id == created.version_id + 1
+
+
+def test_if_can_lock_record_given_empty_payload(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    locks = []
+    get = session.get
+
+    def spy(*args: Any, **kwargs: Any) -> Any:
+        locks.append(kwargs.get("with_for_update"))
+        return get(*args, **kwargs)
+
+    monkeypatch.setattr(session, "get", spy)
+    updated = GroupCRUD(session=session).update(1, lock=True)
+
+    assert updated.id == 1
+    assert locks == [{"nowait": True}]
+
+
+def test_if_can_skip_update_given_empty_payload(engine: Engine) -> None:
+    with session_factory(bind=engine) as session:
+        created = GroupCRUD(session=session).create(title="ABC")
+
+    with session_factory(bind=engine) as session:
+        updated = GroupCRUD(session=session).update(created.id)
+
+    assert updated.id == created.id
+    assert updated.title == "ABC"
+    assert updated.updated_on == created.updated_on
+    assert updated.version_id == created.version_id
+
+
+def test_if_can_update_via_attributes(engine: Engine) -> None:
     with session_factory(bind=engine) as session:
         student = StudentCRUD(session=session).get(1)
 
@@ -192,9 +307,7 @@ def test_if_can_update_via_attributes(engine: Engine, content: SideEffect) -> No
         assert {course.id for course in student.courses} == {1, 2}
 
     with session_factory(bind=engine) as session:
-        course_crud = CourseCRUD(session=session)
-        course_1 = course_crud.get(1)
-        course_5 = course_crud.get(5)
+        course_1, course_5 = CourseCRUD(session=session).get_many([1, 5])
 
         student = StudentCRUD(session=session).get(1)
         student.courses.remove(course_1)
@@ -212,209 +325,302 @@ def test_if_can_update_via_attributes(engine: Engine, content: SideEffect) -> No
         assert student.updated_on > student.created_on
 
 
-def test_if_can_get_one_to_one_related_field(
-    engine: Engine, content: SideEffect
-) -> None:
+def test_if_can_set_many_to_many_related_field(engine: Engine) -> None:
     with session_factory(bind=engine) as session:
-        student = StudentCRUD(session=session).get(1)
-        assert student.id == 1
-        assert student.locker.id == 1
+        student_crud = StudentCRUD(session=session)
+        student = student_crud.get(1)
+        student_crud.set_many_to_many(student, "courses", [2, 5])
+
+        assert {course.id for course in student.courses} == {2, 5}
 
     with session_factory(bind=engine) as session:
-        locker = LockerCRUD(session=session).get(1)
-        assert locker.id == 1
-        assert locker.student.id == 1
+        student_crud = StudentCRUD(session=session)
+        student = student_crud.get(1)
 
+        assert {course.id for course in student.courses} == {2, 5}
 
-def test_if_can_get_one_to_many_related_field(
-    engine: Engine, content: SideEffect
-) -> None:
-    with session_factory(bind=engine) as session:
-        group = GroupCRUD(session=session).get(1)
-        assert group.id == 1
-        assert {student.id for student in group.students} == {1, 2, 3, 4, 5}
+        student_crud.set_many_to_many(student, "courses", [])
+        assert student.courses == []
+
+        with pytest.raises(ValueError):
+            student_crud.set_many_to_many(student, "locker", [1])
 
 
-def test_if_can_get_many_to_many_related_field(
-    engine: Engine, content: SideEffect
+def test_if_can_expire_reverse_side_when_setting_many_to_many_related_field(
+    session: Session,
 ) -> None:
-    with session_factory(bind=engine) as session:
-        student = StudentCRUD(session=session).get(1)
-        assert student.id == 1
-        assert {course.id for course in student.courses} == {1, 2}
+    course_2, course_5 = CourseCRUD(session=session).get_many([2, 5])
+    assert 1 in {student.id for student in course_2.students}
+    assert 1 not in {student.id for student in course_5.students}
 
-    with session_factory(bind=engine) as session:
-        course = CourseCRUD(session=session).get(1)
-        assert course.id == 1
-        assert {student.id for student in course.students} == {1, 4, 5, 6, 7}
+    student_crud = StudentCRUD(session=session)
+    student = student_crud.get(1)
+    student_crud.set_many_to_many(student, "courses", [5])
+
+    assert 1 not in {student.id for student in course_2.students}
+    assert 1 in {student.id for student in course_5.students}
+
+
+def test_if_can_get_pending_record(session: Session) -> None:
+    group_crud = GroupCRUD(session=session)
+    group = Group(id=500, title="ABC")
+    session.add(group)
+
+    retrieved = group_crud.get(500)
+    assert retrieved is group
+    assert retrieved.created_on is not None
+
+
+@pytest.mark.parametrize(
+    "crud_class, related_ids, expected",
+    [
+        (StudentCRUD, lambda student: {student.locker.id}, {1}),
+        (LockerCRUD, lambda locker: {locker.student.id}, {1}),
+        (GroupCRUD, lambda group: {s.id for s in group.students}, {1, 2, 3, 4, 5}),
+        (StudentCRUD, lambda student: {c.id for c in student.courses}, {1, 2}),
+        (CourseCRUD, lambda course: {s.id for s in course.students}, {1, 4, 5, 6, 7}),
+    ],
+    ids=[
+        "one-to-one student-locker",
+        "one-to-one locker-student",
+        "one-to-many group-students",
+        "many-to-many student-courses",
+        "many-to-many course-students",
+    ],
+)
+def test_if_can_get_related_field(
+    session: Session,
+    crud_class: Any,
+    related_ids: Callable[[Any], set[int]],
+    expected: set[int],
+) -> None:
+    instance = crud_class(session=session).get(1)
+    assert instance.id == 1
+    assert related_ids(instance) == expected
 
 
-def test_if_can_delete_record(engine: Engine, content: SideEffect) -> None:
+def test_if_can_delete_record(engine: Engine) -> None:
     with session_factory(bind=engine) as session:
         course_crud = CourseCRUD(session=session)
 
         count = course_crud.count()
         assert count == 5
 
-        retrieved = course_crud.get(1)
-        assert retrieved.id == 1
+        assert course_crud.exists(1)
 
         deleted = course_crud.delete(1)
         assert deleted.id == 1
 
         count = course_crud.count()
         assert count == 4
+        assert not course_crud.exists(1)
+
+
+def test_if_can_delete_record_in_single_statement(session: Session) -> None:
+    dummy_crud = DummyCRUD(session=session)
+    created = dummy_crud.create(foo="spam")
+
+    deleted = dummy_crud.delete(created.id)
+    assert deleted.id == created.id
+    assert deleted.foo == "spam"
+
+    with pytest.raises(DoesNotExistError):
+        dummy_crud.get(created.id)
+
+    with pytest.raises(DoesNotExistError) as error:
+        dummy_crud.delete(created.id)
 
+    assert error.value.kwargs == dict(id=created.id)
 
-def test_if_can_rollback_transaction_when_error_occurs(engine: Engine) -> None:
-    with patch("inzicht.crud.factories.Session") as session_factory_mock:
-        session_mock = MagicMock()
-        session_mock.begin.side_effect = Exception("Boooom!")
-        session_context_mock = MagicMock()
-        session_context_mock.__enter__.return_value = session_mock
-        session_factory_mock.return_value = session_context_mock
 
-        with pytest.raises(Exception) as error:
-            with session_factory(bind=engine) as session:
-                StudentCRUD(session=session).get(1)
+def test_if_can_delete_record_by_id(session: Session) -> None:
+    dummy_crud = DummyCRUD(session=session)
+    created = dummy_crud.create(foo="spam")
 
-        assert str(error.value) == "Boooom!"
+    dummy_crud.delete_by_id(created.id)
+    assert dummy_crud.count() == 0
 
-        session_mock.begin.assert_called_once()
-        session_mock.rollback.assert_called_once()
+    course_crud = CourseCRUD(session=session)
+    course_crud.delete_by_id(1)
+    assert course_crud.count() == 4
+
+    with pytest.raises(DoesNotExistError) as error:
+        dummy_crud.delete_by_id(created.id)
+
+    assert error.value.kwargs == dict(id=created.id)
+
+
+def test_if_can_delete_record_given_composite_primary_key(session: Session) -> None:
+    grade_crud = GenericCRUD[Grade](session=session)
+    grade_crud.create(Grade(student_id=1, course_id=1, value=8))
+    grade_crud.create(Grade(student_id=1, course_id=2, value=9))
+
+    assert grade_crud.get((1, 1)).value == 8
+    assert grade_crud.update((1, 1), value=7).value == 7
+
+    deleted = grade_crud.delete((1, 1))
+    assert deleted.value == 7
+
+    grade_crud.delete_by_id((1, 2))
+    assert grade_crud.count() == 0
+
+    with pytest.raises(TypeError):
+        grade_crud.exists(1)
+
+    with pytest.raises(TypeError):
+        grade_crud.get_many([1])
 
 
-def test_if_can_parameterize_at_instantiation(
-    engine: Engine, content: SideEffect
+class StubSession:
+    def __init__(self) -> None:
+        self.began = False
+        self.rolled_back = False
+
+    def __enter__(self) -> "StubSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def begin(self) -> None:
+        self.began = True
+        raise Exception("Boooom!")
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+
+
+def test_if_can_rollback_transaction_when_error_occurs(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
+    stub = StubSession()
+    monkeypatch.setattr("inzicht.crud.factories.Session", lambda *args, **kwargs: stub)
+    with pytest.raises(Exception) as error:
+        with session_factory(bind=engine) as session:
+            StudentCRUD(session=session).get(1)
+
+    assert str(error.value) == "Boooom!"
+    assert stub.began
+    assert stub.rolled_back
+
+
+def test_if_can_parameterize_at_instantiation(session: Session) -> None:
+    group_crud = GenericCRUD[Group](session=session)
+
+    with session.begin_nested():
         group = group_crud.create(title="foo_bar_baz")
         created_id = group.id
-
         assert created_id
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
+    session.expire_all()
+    with session.begin_nested():
         group = group_crud.get(created_id)
-
         assert group.id == created_id
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
-        retrieved = group_crud.read(where=Group.title == "foo_bar_baz")
-        (found,) = list(retrieved)
-
+    session.expire_all()
+    with session.begin_nested():
+        (found,) = group_crud.read(where=Group.title == "foo_bar_baz")
         assert found.id == created_id
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
+    session.expire_all()
+    with session.begin_nested():
         updated = group_crud.update(created_id, title="baz_bar_foo")
         assert updated.id == created_id
         assert updated.title == "baz_bar_foo"
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
+    session.expire_all()
+    with session.begin_nested():
         group = group_crud.get(created_id)
-
         assert group.id == updated.id
         assert group.title == "baz_bar_foo"
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
+    session.expire_all()
+    with session.begin_nested():
         deleted = group_crud.delete(created_id)
-
         assert deleted.id == created_id
 
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
-        with pytest.raises(DoesNotExistError) as error:
-            group_crud.get(created_id)
+    session.expire_all()
+    with pytest.raises(DoesNotExistError) as error:
+        group_crud.get(created_id)
 
-        assert (
-            str(error.value)
-            == f"DB operation [GET] on instance of model '<class 'tests.models.Group'>' with id '3' failed because the instance was not found"
-        )
-        assert error.value.kwargs == dict(id=created_id)
+    assert (
+        str(error.value)
+        == f"DB operation [GET] on instance of model '<class 'tests.models.Group'>' with id '3' failed because the instance was not found"
+    )
+    assert error.value.kwargs == dict(id=created_id)
 
 
 def test_if_raises_integrity_error_when_creating_single_instance_given_unique_constraint_violated(
-    engine: Engine,
+    session: Session,
 ) -> None:
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
-        group_crud.create(title="foo_bar_baz")
+    group_crud = GenericCRUD[Group](session=session)
+    group_crud.create(title="foo_bar_baz")
 
     with pytest.raises(IntegrityError) as error:
-        with session_factory(bind=engine) as session:
-            group_crud = GenericCRUD[Group](session=session)
+        with session.begin_nested():
             group_crud.create(title="foo_bar_baz")
 
     assert error.value.kwargs == dict(title="foo_bar_baz")
+    assert group_crud.count(where=Group.title == "foo_bar_baz") == 1
 
 
 def test_if_raises_integrity_error_when_creating_multiple_instances_given_unique_constraint_violated(
-    engine: Engine,
+    session: Session,
 ) -> None:
+    group_crud = GenericCRUD[Group](session=session)
+
     with pytest.raises(IntegrityError):
-        with session_factory(bind=engine) as session:
-            group_crud = GenericCRUD[Group](session=session)
+        with session.begin_nested():
             group_crud.bulk_create(
-                [Group(title=f"foo_bar_baz"), Group(title=f"foo_bar_baz")]
+                [Group(title="foo_bar_baz"), Group(title="foo_bar_baz")]
             )
 
+    assert group_crud.count(where=Group.title == "foo_bar_baz") == 0
+
+
+def test_if_can_get_multiple_records(student_crud: StudentCRUD) -> None:
+    retrieved = student_crud.get_many([7, 1, 4])
+    assert [item.id for item in retrieved] == [7, 1, 4]
 
-def test_if_raises_error_when_reading_nonexistent_instance(
-    session: Session, content: SideEffect
-) -> None:
     with pytest.raises(DoesNotExistError) as error:
-        group_crud = GenericCRUD[Group](session=session)
-        group_crud.get(42)
+        student_crud.get_many([1, 42, 1024])
 
-    assert (
-        str(error.value)
-        == "DB operation [GET] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
-    )
-    assert error.value.kwargs == dict(id=42)
+    assert error.value.kwargs == dict(ids=[42, 1024])
 
 
-def test_if_raises_error_when_updating_nonexistent_instance(
-    session: Session, content: SideEffect
+@pytest.mark.parametrize(
+    "operation, header, kwargs",
+    [
+        (lambda crud: crud.get(42), "GET", dict(id=42)),
+        (lambda crud: crud.update(42, title="foo"), "UPDATE", dict(id=42, title="foo")),
+        (lambda crud: crud.delete(42), "DELETE", dict(id=42)),
+        (lambda crud: crud.delete_by_id(42), "DELETE", dict(id=42)),
+    ],
+)
+def test_if_raises_error_when_accessing_nonexistent_instance(
+    session: Session,
+    operation: Callable[[GenericCRUD[Group]], Any],
+    header: str,
+    kwargs: dict[str, Any],
 ) -> None:
+    group_crud = GenericCRUD[Group](session=session)
     with pytest.raises(DoesNotExistError) as error:
-        group_crud = GenericCRUD[Group](session=session)
-        group_crud.update(42, title="foo")
+        operation(group_crud)
 
     assert (
         str(error.value)
-        == "DB operation [UPDATE] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
+        == f"DB operation [{header}] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
     )
-    assert error.value.kwargs == dict(id=42, title="foo")
+    assert error.value.kwargs == kwargs
 
 
 def test_if_raises_integrity_error_when_updating_instance_given_unique_constraint_violated(
-    engine: Engine,
+    session: Session,
 ) -> None:
-    with session_factory(bind=engine) as session:
-        group_crud = GenericCRUD[Group](session=session)
-        g1 = group_crud.create(title="foo_bar_baz_1")
-        g2 = group_crud.create(title="foo_bar_baz_2")
+    group_crud = GenericCRUD[Group](session=session)
+    group_crud.create(title="foo_bar_baz_1")
+    created = group_crud.create(title="foo_bar_baz_2")
 
     with pytest.raises(IntegrityError):
-        with session_factory(bind=engine) as session:
-            group_crud = GenericCRUD[Group](session=session)
-            group_crud.update(g2.id, title="foo_bar_baz_1")
-
-
-def test_if_raises_error_when_deleting_nonexistent_instance(
-    session: Session, content: SideEffect
-) -> None:
-    with pytest.raises(DoesNotExistError) as error:
-        group_crud = GenericCRUD[Group](session=session)
-        group_crud.delete(42)
-
-    assert (
-        str(error.value)
-        == "DB operation [GET] on instance of model '<class 'tests.models.Group'>' with id '42' failed because the instance was not found"
-    )
-    assert error.value.kwargs == dict(id=42)
+        with session.begin_nested():
+            group_crud.update(created.id, title="foo_bar_baz_1")